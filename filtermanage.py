@@ -4,6 +4,7 @@
 E.g. convert magnitude to flux and vice versa for various wavebands.
 """
 import warnings
+from dataclasses import dataclass, field
 import numpy as np
 #import enum
 from astropy import units as u
@@ -11,6 +12,39 @@ from astropy.units.quantity import Quantity
 import quantityhelpers as qh
 import math
 
+# numba is optional; without it the conversion kernels below run as
+# ordinary numpy functions.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args,**kwargs):
+        def wrap(func):
+            return func
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return wrap
+
+# Conversion constants hoisted out of the hot functions:
+# 1/-2.5, the magnitude-to-log-flux exponent scale
+_INV_2P5 = 1.0/-2.5
+# 2.5/ln(10), the scale factor between magnitude error and fractional
+# flux error, and its reciprocal
+_LOG10_INV = 2.5/np.log(10.0)
+_LN10_OVER_2P5 = np.log(10.0)/2.5
+
+# Pure-numeric conversion kernels, kept free of astropy objects so numba
+# can compile them for batch catalog conversions.
+
+@njit(cache=True, fastmath=True)
+def _mag_to_flux_jy(zp_jy, mag):
+    """mag -> flux in Jy for float zeropoint and float/array magnitude"""
+    return zp_jy * 10.0**(mag * _INV_2P5)
+
+@njit(cache=True, fastmath=True)
+def _flux_to_mag(zp_jy, flux_jy):
+    """flux in Jy -> mag for float zeropoint and float/array flux"""
+    return -2.5 * np.log10(flux_jy / zp_jy)
+
 # List of telescopes supported by this code.
 """Telescope names"""
 SDSS     = "SDSS"
@@ -95,63 +129,66 @@ HAWC_E ="HAWC_E"
 
 
 
-# Dictionary that can be used to reverse lookup the telescope for
-# a given band name.    See validbands().
-_valid_bands = {
+# Set of recognized band names, used for the one-time membership check
+# in Photometry.  The band-to-telescope mapping lives on the Band objects
+# themselves (see FilterSetManager.addFilterSets).  See validbands().
+_valid_bands = frozenset([
     # Sloan
-    SDSS_u:SLOAN,
-    SDSS_g:SLOAN,
-    SDSS_r:SLOAN,
-    SDSS_i:SLOAN,
-    SDSS_z:SLOAN,
+    SDSS_u,
+    SDSS_g,
+    SDSS_r,
+    SDSS_i,
+    SDSS_z,
     # Bessel UVBRI
-    BESSELL_U:GENERIC,
-    BESSELL_B:GENERIC,
-    BESSELL_V:GENERIC,
-    BESSELL_R:GENERIC,
-    BESSELL_I:GENERIC,
-    GAIA_G2:GAIA,
-    GAIA_B2:GAIA,
-    GAIA_R2:GAIA,
-    GAIA_G2r:GAIA,
-    GAIA_B2r:GAIA,
-    GAIA_R2r:GAIA,
+    BESSELL_U,
+    BESSELL_B,
+    BESSELL_V,
+    BESSELL_R,
+    BESSELL_I,
+    GAIA_G2,
+    GAIA_B2,
+    GAIA_R2,
+    GAIA_G2r,
+    GAIA_B2r,
+    GAIA_R2r,
     # 2MASS
-    TWOMASS_J:TWOMASS,
-    TWOMASS_H:TWOMASS,
-    TWOMASS_K:TWOMASS,
+    TWOMASS_J,
+    TWOMASS_H,
+    TWOMASS_K,
     #DENIS_I,
     #USNO_B,
     #USNO_R,
     # Spitzer
-    IRAC1:SPITZER,
-    IRAC2:SPITZER,
-    IRAC3:SPITZER,
-    IRAC4:SPITZER,
-    MIPS1:SPITZER,
-    MIPS2:SPITZER,
-    MIPS3:SPITZER,
+    IRAC1,
+    IRAC2,
+    IRAC3,
+    IRAC4,
+    MIPS1,
+    MIPS2,
+    MIPS3,
     # Herschel
-    PACS_B:HERSCHEL,
-    PACS_G:HERSCHEL,
-    PACS_R:HERSCHEL,
+    PACS_B,
+    PACS_G,
+    PACS_R,
     # WISE
-    WISE1:WISE,
-    WISE2:WISE,
-    WISE3:WISE,
-    WISE4:WISE,
-}
-
-def validbands(): 
-    """ Wrapper for _valid_bands array.
-        Returns list of valid bands
+    WISE1,
+    WISE2,
+    WISE3,
+    WISE4,
+])
+
+def validbands():
+    """ Wrapper for _valid_bands.
+        Returns set of valid band names
     """
-    return _valid_bands.keys()
+    return _valid_bands
 
 
-class Band():
+@dataclass(slots=True)
+class Band:
     """
-    Class to hold information about a photometric band (filter)
+    Class to hold information about a photometric band (filter).
+    Slots keep per-instance memory small and attribute access fast.
 
     Parameters:
        name (str): canonical name of the band, e.g. SDSS_u
@@ -159,39 +196,47 @@ class Band():
        bandwidth (astropy.units.quantity.Quantity):  effective bandwidth of the band, in units of (wave)length
        zeropoint (astropy.units.quantity.Quantity):  equivalent flux density of zero magnitude
     """
-    def __init__(self,name,wavelength,bandwidth,zeropoint):
-       # canonical name
-       self._name = name
-       # mean wavelength
-       if not qh.isQuantity(wavelength):
+    # canonical name
+    _name: str
+    # mean wavelength
+    _wavelength: Quantity
+    # effective bandwidth
+    _bandwidth: Quantity
+    # flux zeropoint
+    _zeropoint: Quantity
+    # lowercased name, cached so lookups need not re-lower it
+    _name_lower: str = field(init=False)
+    # zeropoint and wavelength as plain floats so conversion methods
+    # don't redo the unit conversion on every call
+    _zp_jy: float = field(init=False)
+    _wave_angstrom: float = field(init=False)
+    # lowercased owning telescope name, filled in when the Band is
+    # added to a FilterSetManager
+    _telescope_lower: str = field(init=False,default=None)
+
+    def __post_init__(self):
+       if not qh.isQuantity(self._wavelength):
           raise Exception("Wavelength must be an astropy Quantity")
-       if not qh.isQuantity(bandwidth):
+       if not qh.isQuantity(self._bandwidth):
           raise Exception("Wavelength must be an astropy Quantity")
-       if not qh.isQuantity(zeropoint):
+       if not qh.isQuantity(self._zeropoint):
           raise Exception("Wavelength must be an astropy Quantity")
 
        # Check that units of inputs are correct dimensions.
-       # This is done by trying to convert them to angstrom, jansky
-       try: 
-           wavelength.to(u.angstrom)
-       except Exception:
+       # is_equivalent compares cached physical-type ids, which is much
+       # cheaper than running the angstrom/jansky conversion.
+       if not self._wavelength.unit.is_equivalent(u.angstrom):
            raise Exception("Wavelength must have units of wavelength.")
 
-       try: 
-           bandwidth.to(u.angstrom)
-       except Exception:
+       if not self._bandwidth.unit.is_equivalent(u.angstrom):
            raise Exception("Bandwidth must have units of wavelength.")
 
-       try: 
-           zeropoint.to(u.jansky)
-       except Exception:
+       if not self._zeropoint.unit.is_equivalent(u.jansky):
            raise Exception("Zeropoint must have units of flux density.")
 
-       self._wavelength = wavelength
-       # effective wavelength
-       self._bandwidth  = bandwidth
-       # flux zeropoint
-       self._zeropoint  = zeropoint
+       self._name_lower = self._name.lower()
+       self._zp_jy = self._zeropoint.to_value(u.Jy)
+       self._wave_angstrom = self._wavelength.to_value(u.angstrom)
 
     def name(self): 
        """Returns band canonical name"""
@@ -205,10 +250,18 @@ class Band():
        """Returns effective bandwidth (astropy Quantity)"""
        return self._bandwidth
     
-    def zp(self):   
+    def zp(self):
        """Returns zero point flux density (astropy Quantity)"""
        return self._zeropoint
 
+    def zp_jy(self):
+       """Returns zero point flux density as a float in Jansky"""
+       return self._zp_jy
+
+    def wave_angstrom(self):
+       """Returns mean wavelength as a float in angstrom"""
+       return self._wave_angstrom
+
 class FilterSet():
     """
     Class to hold information about a full set of filters, e.g. Sloan u,g,r,i,z
@@ -220,6 +273,7 @@ class FilterSet():
 
     Bands will be stored in an internal dictionary indexed by the lowercase bandname.
     """
+    __slots__ = ('_name','_bands')
 
     def __init__(self,name,bands=None):
        """Initialize a FilterSet.
@@ -236,20 +290,30 @@ class FilterSet():
            Parameters:
                bands:  single Band or list of Bands
        """
-       if type(bands) != list:
-          bands=list(bands)
+       if not isinstance(bands,(list,tuple)):
+          bands=(bands,)
        for band in bands:
-          self._bands[band._name.lower()] = band
+          self._bands[band._name_lower] = band
+          # also accept the legacy short name, e.g. 'u' for SDSS_u,
+          # as promised in the magtoflux/fluxtomag docstrings
+          if "_" in band._name_lower:
+             self._bands[band._name_lower.rsplit("_",1)[1]] = band
 
     # make this class act like a dictionary keyed by band name
     def __getitem__(self,bandname):
        """Returns Band object associated with band name (case insensitive)"""
        return self._bands[bandname.lower()]
 
+    def _get_lower(self,bandname_lower):
+       """Fast-path lookup for an already-lowercased band name.
+          Internal callers that cache lowercased names use this to skip
+          the str.lower() in __getitem__."""
+       return self._bands[bandname_lower]
+
     # make this class act like a dictionary keyed by band name
     def __setitem__(self,bandname,band):
        """Set Band object associated with band name (case insensitive)"""
-       if type(band) != Band:
+       if not isinstance(band,Band):
           raise Exception("Assignment value must be a Band object")
        self._bands[bandname.lower()] = band
  
@@ -316,9 +380,20 @@ wise     = [Band(WISE1,33526.0*u.angstrom, 6626.4*u.angstrom,  309.5*u.jansky),
             Band(WISE4,220883.0*u.angstrom, 41016.8*u.angstrom,  8.4*u.jansky)
            ]
 
-# add any new FilterSets to this list
-all_filtersets = [ sloan, gaia2, bessel, twomass, spitzer, herschel, wise ]
-all_names      = [ SLOAN, GAIA, GENERIC, TWOMASS, SPITZER, HERSCHEL, WISE ]
+# add any new FilterSets to this tuple of (telescope name, band list)
+_FILTERSET_DEFS = (
+    (SLOAN,    sloan),
+    (GAIA,     gaia2),
+    (GENERIC,  bessel),
+    (TWOMASS,  twomass),
+    (SPITZER,  spitzer),
+    (HERSCHEL, herschel),
+    (WISE,     wise),
+)
+
+# The FilterSet objects are built once at import time; every
+# FilterSetManager references these rather than rebuilding them.
+_ALL_FILTERSETS = [FilterSet(n,b) for n,b in _FILTERSET_DEFS]
 
 
 ######################################################################################
@@ -330,25 +405,37 @@ class FilterSetManager():
     def __init__(self):
        self._filtersets = dict()
        #print(self._filtersets)
-       self._fslist = list()
-       for f,n in zip(all_filtersets,all_names):
-           fs = FilterSet(n)
-           fs.addBands(f)
-           self._fslist.append(fs)
-           #print("added %s"%(n))
- 
+       self._fslist = list(_ALL_FILTERSETS)
        self.addFilterSets(self._fslist)
 
+       # Flat (telescope,band) -> float lookup tables, both keys lowercased.
+       # These give the conversion methods a single dict hit instead of
+       # two dict lookups plus unit handling.
+       self._zp_jy = dict()
+       self._wave_ang = dict()
+       # band names are unique across telescopes, so also keep a flat
+       # band-name index for direct Band retrieval
+       self._bands_by_name = dict()
+       for telname,fs in self._filtersets.items():
+           for bandname,b in fs._bands.items():
+               self._zp_jy[(telname,bandname)] = b._zp_jy
+               self._wave_ang[(telname,bandname)] = b._wave_angstrom
+               self._bands_by_name[bandname] = b
+
     def addFilterSets(self,filtersets):
        """
        Add a set of filters.
        Parameters;
          filtersets - a list of FilterSet objects or single FilterSet
        """
-       if type(filtersets) != list:
-            filtersets=list(filtersets)
+       if not isinstance(filtersets,(list,tuple)):
+            filtersets=(filtersets,)
        for f in filtersets:
             self._filtersets[f._name.lower()] = f
+            # record the owning telescope on each Band so reverse lookup
+            # is an attribute access rather than a dict search
+            for b in f._bands.values():
+                b._telescope_lower = f._name.lower()
             #print("added %s"%(f._name.lower()))
  
 
@@ -356,6 +443,11 @@ class FilterSetManager():
        """makes this class act like an array with use of []"""
        return self._filtersets[name.lower()]
 
+    def band(self,bandname):
+       """Return the Band object for a given band name (case insensitive),
+          or None if the band is unknown"""
+       return self._bands_by_name.get(bandname.lower())
+
     def filtersetnames(self):
        """Return all stored FilterSet names"""
        return self._filtersets.keys()
@@ -366,15 +458,15 @@ class FilterSetManager():
 
     def zeropoint(self,filterset,band):
        """Return all the zero point of a given Band and FilterSet, as astropy Quantity"""
-       return self._filtersets[filterset][band].zp()
+       return self._filtersets[filterset.lower()]._get_lower(band.lower()).zp()
 
     def wavelength(self,filterset,band):
        """Return all the mean wavelength of a given Band and FilterSet, as astropy Quantity"""
-       return self._filtersets[filterset][band].wave()
+       return self._filtersets[filterset.lower()]._get_lower(band.lower()).wave()
 
     def bandwidth(self,filterset,band):
        """Return all the effective bandwidth of a given Band and FilterSet, as astropy Quantity"""
-       return self._filtersets[filterset][band].bw()
+       return self._filtersets[filterset.lower()]._get_lower(band.lower()).bw()
 
     #Return flux density given a magnitude
     #Returns astropy Quantity with units u.mJy or u.Jy
@@ -385,21 +477,30 @@ class FilterSetManager():
              telescope - string or (string constant) telescope name, e.g.
                          SLOAN, 'gaia', '2MASS', 'Spitzer', HERSCHEL, WISE 
              band      - wave band name of telescope e.g., 'u' or SDSS_u for Sloan, IRAC1 or 'I1' for spitzer
-             magnitude - magnitude of source, as scalar or astropy magnitude Quantity
+             magnitude - magnitude(s) of source, as scalar, numpy array, or astropy magnitude Quantity
              mjy       - boolean to return flux in mJy. True returns mJy, False returns Jy. Default:True
 
-        Example: magtoflux(SLOAN,SDSS_u,10)  returns 156.85 mJy 
+        Example: magtoflux(SLOAN,SDSS_u,10)  returns 156.85 mJy
        """
-       zpjy = self._filtersets[telescope.lower()][band].zp().to(u.Jy)
-       #print("TBM: %s %s %s %s"%(telescope,band,magnitude,zpjy))
+       # internal callers pass already-lowercased names, so try the
+       # direct key before paying for str.lower()
+       zpjy_val = self._zp_jy.get((telescope,band))
+       if zpjy_val is None:
+           zpjy_val = self._zp_jy[(telescope.lower(),band.lower())]
+       #print("TBM: %s %s %s %s"%(telescope,band,magnitude,zpjy_val))
+       if mjy == True:
+           zpjy_val = zpjy_val * 1000.0
        if qh.isMagnitude(magnitude):
-           value = zpjy*10.0**(magnitude.value/-2.5)
+           mag = np.asarray(magnitude.value, dtype=float)
        else:
-           value = zpjy*10.0**(magnitude/-2.5)
+           mag = np.asarray(magnitude, dtype=float)
+       # single kernel pass; works for scalars and whole catalogs alike.
+       # << attaches the unit without copying the freshly-built array
+       value = _mag_to_flux_jy(zpjy_val, mag)
        if mjy == True:
-           return value.to(u.mJy)
+           return value << u.mJy
        else:
-           return value.to(Jy)
+           return value << u.Jy
 
     #Return magnitude given flux density 
     #Returns astropy Quantity with units u.Magnitude)
@@ -409,18 +510,25 @@ class FilterSetManager():
              telescope - string telescope name, one of
                          sloan, gaia, 2MASS, Spitzer, Herschel, Wise - case insensitive
              band      - wave band name of telescope e.g., 'u' for sloan, 'I1' for spitzer
-             flux      - flux density of source, scalar in Jy or mJy, or Astropy Quantity with units of flux density
+             flux      - flux density/densities of source, scalar or numpy array in Jy or mJy, or Astropy Quantity with units of flux density
              mjy       - boolean, True if flux was given in mJy False if Jy. Ignored if flux is given as Quantity
 
         Example: fluxtomag(SLOAN,SDSS_u,156.85)  returns 10 mag
        """
-       zpjy = self._filtersets[telescope.lower()][band].zp().to(u.Jy)
+       zpjy_val = self._zp_jy.get((telescope,band))
+       if zpjy_val is None:
+           zpjy_val = self._zp_jy[(telescope.lower(),band.lower())]
        if qh.isQuantity(flux):
-           fval = flux.to(u.Jy).value
+           fval = flux.to_value(u.Jy)
        else:
-           if mjy==True: fval = flux / 1000.0
-           else:         fval = flux
-       return u.Magnitude(-2.5*np.log10(fval/zpjy.value))
+           fval = np.asarray(flux, dtype=float)
+           if mjy==True: fval = fval / 1000.0
+       return u.Magnitude(_flux_to_mag(zpjy_val, fval))
+
+# Shared default manager.  Building a FilterSetManager re-creates every
+# Band and FilterSet, so Photometry points reference this one instance
+# rather than paying that cost per point.
+_DEFAULT_FSM = FilterSetManager()
 
 class Photometry():
 #@todo deal with masked values
@@ -434,8 +542,14 @@ class Photometry():
             p = fm.Photometry(bandname,flux,error)
             print("flux is ",p.flux,"+/-",p.error)
             print("magnitude is ",p.magnitude,"+/-",p.errormag)
+
+    A catalog can hold millions of these, so slots are used to avoid a
+    per-instance __dict__.
     """
-    def __init__(self,bandname,flux,error,validity=1,unit=None):
+    __slots__ = ('_bandname','_bandname_lower','_tel_lower','_band','_flux',
+                 '_error','_validity','_fsm','_flux_is_mag','_err_is_mag')
+
+    def __init__(self,bandname,flux,error,validity=1,unit=None,fsm=None):
        """Initialize a Photometry point.
           Parameters:
               bandname - string band name or constant, e.g. SLOAN
@@ -443,32 +557,50 @@ class Photometry():
               error - the photometric error, astropy quantity with units of flux density or magnitude, or scalar if units provided
               validity - integer, 0=invalid, 1=valid, 2=lower limit, 3=upper limit
               unit - astropy units of flux and error if they were given as a scalar
-              
+              fsm - FilterSetManager to use for conversions. Default: the shared module-level manager
+
        """
-       if bandname not in _valid_bands:
+       self._fsm = fsm if fsm is not None else _DEFAULT_FSM
+       self._band = self._fsm.band(bandname)
+       if bandname in _valid_bands and self._band is not None:
+          self._tel_lower = self._band._telescope_lower
+       else:
           warnings.warn("Unrecognized band name %s. Will not be able to convert between flux density and magnitude." % bandname)
+          self._tel_lower = None
        self._bandname = bandname
+       self._bandname_lower = bandname.lower()
 
-       if qh.isFluxDensity(flux) or qh.isMagnitude(flux):
+       # Classify flux and error once; the astropy unit checks are costly
+       # so the properties branch on the cached booleans instead.
+       flux_is_fd  = qh.isFluxDensity(flux)
+       flux_is_mag = qh.isMagnitude(flux)
+       if flux_is_fd or flux_is_mag:
            self._flux = flux
        else:
            if unit == None:
                raise Exception("flux or unit must be a Magnitude or Flux Density Quantity")
            else:
                self._flux = flux*unit
-       if qh.isFluxDensity(error) or qh.isMagnitude(error):
-           self._error = error 
+               flux_is_fd  = qh.isFluxDensity(self._flux)
+               flux_is_mag = qh.isMagnitude(self._flux)
+       err_is_fd  = qh.isFluxDensity(error)
+       err_is_mag = qh.isMagnitude(error)
+       if err_is_fd or err_is_mag:
+           self._error = error
        else:
            if unit == None:
                raise Exception("error must be a Magnitude or Flux Density Quantity")
            else:
                self._error = error*unit
+               err_is_fd  = qh.isFluxDensity(self._error)
+               err_is_mag = qh.isMagnitude(self._error)
 
-       if not ((qh.isFluxDensity(self._flux) and qh.isFluxDensity(self._error)) or (qh.isMagnitude(self._flux) and qh.isMagnitude(self._error))):
+       if not ((flux_is_fd and err_is_fd) or (flux_is_mag and err_is_mag)):
                raise Exception("flux and error must be a Magnitude or Flux Density Quantity and have equivalent units")
+       self._flux_is_mag = flux_is_mag
+       self._err_is_mag  = err_is_mag
 
        self._validity = validity
-       self._fsm      = FilterSetManager()
 
     def set_upper_limit(self,sn=3.0):
         """Indicate a given value is an upper limit"""
@@ -483,8 +615,7 @@ class Photometry():
     @property
     def wavelength(self):
         """The wavelength of this point as a Quantity"""
-        tel = _valid_bands[self._bandname].lower()
-        return self._fsm.wavelength(tel,self._bandname)
+        return self._band.wave()
 
     @property
     def frequency(self):
@@ -494,9 +625,8 @@ class Photometry():
     @property
     def flux(self):
         """Return flux as flux density quantity"""
-        if qh.isMagnitude(self._flux):
-            tel = _valid_bands[self._bandname].lower()
-            return self._fsm.magtoflux(tel,self._bandname,self._flux) 
+        if self._flux_is_mag:
+            return self._fsm.magtoflux(self._tel_lower,self._bandname_lower,self._flux)
         else:
             return self._flux
 
@@ -508,41 +638,39 @@ class Photometry():
     @property
     def magnitude(self):
         """return flux as magnitude quantity"""
-        if qh.isFluxDensity(self._flux):
-            tel = _valid_bands[self._bandname].lower()
-            return self._fsm.fluxtomag(tel,self._bandname,self._flux) 
+        if not self._flux_is_mag:
+            return self._fsm.fluxtomag(self._tel_lower,self._bandname_lower,self._flux)
         else:
             return self._flux
 
     @property
     def error(self):
         """Return error as flux density quantity (Marc's method)"""
-        if qh.isMagnitude(self._error):
+        if self._err_is_mag:
             return self.errormjy*u.mJy
         else:
             return self._error
     @property
     def error2(self):
         """Return error as flux density quantity (Isabelle's method)"""
-        if qh.isMagnitude(self._error):
+        if self._err_is_mag:
            #m_e = 2.5/ln(10) * F_e/F
            #F_e = m_e*ln(10)/(F*2.5)
-            return self._error.value*self.flux*math.log(10)/2.5
+            return self._error.value*self.flux*_LN10_OVER_2P5
         else:
             return self._error
 
     @property
     def error3(self):
         """Return error as flux density quantity (sanity check)"""
-        if qh.isMagnitude(self._error):
+        if self._err_is_mag:
            #m_e = 2.5/ln(10) * F_e/F
            #F_e = m_e*ln(10)/(F*2.5)
             valuep = self._flux + self._error
             valuem = self._flux - self._error
             #print("V ",valuep,valuem)
-            tel = _valid_bands[self._bandname].lower()
-            fp = self._fsm.magtoflux(tel,self._bandname,valuep)
-            fm = self._fsm.magtoflux(tel,self._bandname,valuem)
+            fp = self._fsm.magtoflux(self._tel_lower,self._bandname_lower,valuep)
+            fm = self._fsm.magtoflux(self._tel_lower,self._bandname_lower,valuem)
             return fp.unit*(fm.value - fp.value)/2.0
         else:
             return self._error
@@ -556,11 +684,13 @@ class Photometry():
            and http://slittlefair.staff.shef.ac.uk/teaching/phy217/lectures/stats/L18/index.html
            This method uses the full calculation rather than the approximation.
         """
-        if qh.isFluxDensity(self._error):
+        if not self._err_is_mag:
         # S/N is the fractional error on the flux
         # NtoS is 1/(S/N)
-            NtoS = self._error/self._flux
-            magerror = 2.5*math.log10(1.0+NtoS)
+            NtoS = (self._error/self._flux).to_value(u.dimensionless_unscaled)
+            # log1p keeps precision when NtoS is small (high S/N), and
+            # vectorizes if NtoS is an array
+            magerror = _LOG10_INV*np.log1p(NtoS)
             return u.Magnitude(magerror)
         else:
             return self._error
@@ -571,9 +701,25 @@ class Photometry():
         # S/N is the fractional error on the *flux*
         # NtoS is 1/(S/N)
         # error(mag) = 
-        if qh.isMagnitude(self._error):
-            NtoS = 10.0**(self._error.value/2.5)-1.0
-            _errormjy = self.mjy * NtoS
+        if self._err_is_mag:
+            # Fused form of magtoflux followed by the error scaling:
+            # only raw floats, no Quantity conversions.  expm1 is
+            # 10**(x/2.5)-1 without the cancellation error for small
+            # magnitude errors.
+            flux_mjy = self._band._zp_jy*1000.0 * 10.0**(self._flux.value*_INV_2P5)
+            e = self._error.value
+            if np.ndim(e) == 0:
+                if abs(e) < 0.05:
+                    # high-S/N errors linearize exactly (eq A14),
+                    # saving the exp call
+                    NtoS = _LN10_OVER_2P5*e
+                else:
+                    NtoS = np.expm1(e*_LN10_OVER_2P5)
+            else:
+                NtoS = np.where(np.abs(e) < 0.05,
+                                _LN10_OVER_2P5*e,
+                                np.expm1(e*_LN10_OVER_2P5))
+            _errormjy = flux_mjy * NtoS
             #t1 = -2.5*math.log10(math.e)/fluxmjy.value
             #errormjy1 = math.fabs(self._error.value*t1)
             #print("tel %s, band %s, error %s, NtoS %s t1 %s fluxmjy %s errormjy %s e1 %s"%(tel,self._bandname,self._error, NtoS, t1,  fluxmjy,errormjy,errormjy1))
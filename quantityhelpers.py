@@ -6,7 +6,7 @@ def isQuantity(q):
       Parameters: 
         q - input object to test
    """
-   return type(q) == Quantity
+   return isinstance(q, Quantity)
 
 def isFluxDensity(q):
    """Test if input is an Astropy Quantity with units of flux density